@@ -12,8 +12,8 @@ Requirements:
 from __future__ import annotations
 
 import argparse
+import functools
 import os
-import subprocess
 from pathlib import Path
 from typing import Any, Dict, List, Union
 
@@ -29,86 +29,17 @@ from google.ai.generativelanguage import (
 )
 from langgraph.graph import END, StateGraph
 
-ROOT = Path(__file__).resolve().parent
-ARTIFACTS_DIR = ROOT / "reports"
-
-
-def run_git(*args: str) -> str:
-    allow_non_zero = args and args[0] == "diff"
-    result = subprocess.run(["git", *args], capture_output=True, text=True)
-    if result.returncode not in (0, 1) or (result.returncode == 1 and not allow_non_zero):
-        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
-    return result.stdout.strip()
-
-
-def gather_repo_tree() -> str:
-    tracked = run_git("ls-files")
-    return tracked if tracked else "<no tracked files>"
-
-
-def gather_git_context() -> tuple[str, str, List[str]]:
-    status = run_git("status", "-sb")
-    diff_output = run_git("diff", "--no-color")
-
-    untracked = run_git("ls-files", "--others", "--exclude-standard")
-    if untracked:
-        pieces: list[str] = [diff_output] if diff_output else []
-        for path in untracked.splitlines():
-            file_diff = run_git("diff", "--no-color", "--", "/dev/null", path)
-            if file_diff:
-                pieces.append(file_diff)
-        diff_output = "\n\n".join(pieces)
-
-    changed_files = run_git("diff", "--name-only").splitlines()
-    if untracked:
-        changed_files.extend(untracked.splitlines())
-
-    changed_files = sorted({path for path in changed_files if path})
-    return status, diff_output.strip(), changed_files
-
-
-def safe_resolve(path: str) -> Path:
-    target = (ROOT / path).resolve()
-    if ROOT not in target.parents and target != ROOT:
-        raise ValueError("Access outside repo root is not allowed")
-    return target
-
-
-def tool_list_dir(path: str = ".") -> str:
-    try:
-        p = safe_resolve(path)
-        entries = sorted(x.name + ("/" if x.is_dir() else "") for x in p.iterdir())
-        return "\n".join(entries)
-    except Exception as exc:  # pragma: no cover - defensive
-        return f"<ls error: {exc}>"
-
-
-def tool_read_file(path: str, start: int = 0, length: int = 4000) -> str:
-    try:
-        p = safe_resolve(path)
-        data = p.read_text(errors="ignore")
-        return data[start : start + length]
-    except Exception as exc:  # pragma: no cover - defensive
-        return f"<cat error: {exc}>"
-
-
-def tool_search_text(pattern: str, path: str = ".") -> str:
-    try:
-        p = safe_resolve(path)
-        result = subprocess.run(
-            ["rg", "-n", pattern, str(p)],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode not in (0, 1):
-            return f"<rg error: {result.stderr.strip() or result.stdout.strip()}>"
-        return (result.stdout or "").strip()[:8000]
-    except FileNotFoundError:
-        return "<rg not installed>"
-    except Exception as exc:  # pragma: no cover - defensive
-        return f"<rg error: {exc}>"
-
+from workflow_common import (
+    ROOT,
+    GitContext,
+    clear_tool_caches,
+    dispatch_tool_call,
+    gather_context,
+    write_artifact,
+)
 
+# Built once at import and shared by every model instance; treat as read-only.
+# make_model() is memoized on the assumption that this list never changes.
 TOOLS: list[Any] = [
     Tool(
         function_declarations=[
@@ -137,11 +68,11 @@ TOOLS: list[Any] = [
                         ),
                         "start": Schema(
                             type=Type.INTEGER,
-                            description="Byte/char offset (default 0)",
+                            description="Byte offset (default 0)",
                         ),
                         "length": Schema(
                             type=Type.INTEGER,
-                            description="Max chars to return (default 4000)",
+                            description="Max bytes to return (default 4000, capped at 1MB)",
                         ),
                     },
                     required=["path"],
@@ -169,26 +100,35 @@ TOOLS: list[Any] = [
 ]
 
 
-def build_seed_prompt(prompt_template: str, repo_tree: str, changed_files: List[str], status: str, diff: str) -> str:
-    changed_files_block = "\n".join(changed_files) if changed_files else "<none>"
-    status_block = status or "<clean>"
-    diff_block = diff or "<empty diff>"
-    return (
-        f"{prompt_template}\n\n"
-        f"Repository structure:\n{repo_tree}\n\n"
-        f"Changed files:\n{changed_files_block}\n\n"
-        f"<status>\n{status_block}\n</status>\n\n"
-        f"<diff>\n{diff_block}\n</diff>\n"
+def build_seed_prompt(prompt_template: str, context: GitContext) -> str:
+    changed_files_block = "\n".join(context.changed_files) if context.changed_files else "<none>"
+    # Join once instead of chaining concatenations over the large tree/diff blobs.
+    return "".join(
+        [
+            prompt_template,
+            "\n\nRepository structure:\n",
+            context.repo_tree,
+            "\n\nChanged files:\n",
+            changed_files_block,
+            "\n\n<status>\n",
+            context.status or "<clean>",
+            "\n</status>\n\n<diff>\n",
+            context.diff or "<empty diff>",
+            "\n</diff>\n",
+        ]
     )
 
 
+@functools.lru_cache(maxsize=8)
 def make_model(system_instruction: str, model_name: str) -> genai.GenerativeModel:
+    # GenerativeModel converts TOOLS into its proto tool config on construction;
+    # reuse instances so a long-lived process pays that cost once per prompt/model.
     return genai.GenerativeModel(model_name, tools=TOOLS, system_instruction=system_instruction)
 
 
 def model_node(state: Dict[str, Any]) -> Dict[str, Any]:
     model: genai.GenerativeModel = state["model"]
-    raw_messages: List[Any] = state.get("messages", [])
+    contents: List[Content] = state.get("messages", [])
     
     # Track iterations to prevent infinite loops
     iteration_count = state.get("iteration_count", 0)
@@ -201,37 +141,20 @@ def model_node(state: Dict[str, Any]) -> Dict[str, Any]:
     
     state["iteration_count"] = iteration_count + 1
 
-    # Normalize messages into Content objects
-    contents: List[Content] = []
-    for m in raw_messages:
-        if isinstance(m, Content):
-            contents.append(m)
-            continue
-        if isinstance(m, dict):
-            role = m.get("role", "user")
-            parts_raw = m.get("parts")
-            if parts_raw is None and "content" in m:
-                parts_raw = [m["content"]]
-            parts: List[Part] = []
-            for p in parts_raw or []:
-                if isinstance(p, Part):
-                    parts.append(p)
-                else:
-                    parts.append(Part(text=str(p)))
-            contents.append(Content(role=role, parts=parts))
-            continue
-        # fallback: treat as user text
-        contents.append(Content(role="user", parts=[Part(text=str(m))]))
+    # History only ever holds Content: the seed message from main() and the
+    # function responses appended by apply_tool_node. Each turn checks the newest
+    # entry, so the whole list stays covered without re-wrapping it every time.
+    assert not contents or isinstance(contents[-1], Content), "messages must be Content objects"
 
     response = model.generate_content(contents)
     state["last_response"] = response
 
-    # Detect tool call
-    tool_call = None
-    for part in response.parts:
-        if hasattr(part, "function_call") and part.function_call is not None:
-            tool_call = part.function_call
-            break
+    # Detect tool call: one getattr per part both tests and fetches the field.
+    parts = response.parts
+    tool_call = next(
+        (fc for part in parts if (fc := getattr(part, "function_call", None)) is not None),
+        None,
+    )
 
     if tool_call:
         state["tool_call"] = tool_call
@@ -266,28 +189,12 @@ def apply_tool_node(state: Dict[str, Any]) -> Dict[str, Any]:
     return state
 
 
-def dispatch_tool_call(name: str, args: dict[str, Any]) -> str:
-    if name == "list_dir":
-        return tool_list_dir(args.get("path", "."))
-    if name == "read_file":
-        return tool_read_file(args["path"], args.get("start", 0), args.get("length", 4000))
-    if name == "search_text":
-        return tool_search_text(args["pattern"], args.get("path", "."))
-    return f"<unknown tool: {name}>"
-
-
-def write_artifact(filename: str, content: str) -> Path:
-    ARTIFACTS_DIR.mkdir(exist_ok=True)
-    path = ARTIFACTS_DIR / filename
-    path.write_text(content, encoding="utf-8")
-    return path
-
-
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--prompt-file", type=Path, default=Path("prompts/default_impact_prompt.txt"))
     parser.add_argument("--model", default="gemini-2.5-flash")
     args = parser.parse_args()
+    clear_tool_caches()
 
     api_key = os.getenv("GEMINI_API_KEY")
     if not api_key:
@@ -295,16 +202,12 @@ def main() -> None:
     genai.configure(api_key=api_key)
 
     prompt_template = args.prompt_file.read_text(encoding="utf-8")
-    repo_tree = gather_repo_tree()
-    status, diff, changed_files = gather_git_context()
+    context = gather_context()
     architecture_path = ROOT / "architecture.md"
     architecture = architecture_path.read_text(encoding="utf-8") if architecture_path.exists() else "<none>"
 
-    seed_prompt = build_seed_prompt(prompt_template, repo_tree, changed_files, status, diff)
-    seed_message = (
-        f"{seed_prompt}\n\n"
-        f"Architecture:\n{architecture}\n"
-    )
+    seed_prompt = build_seed_prompt(prompt_template, context)
+    seed_message = "".join([seed_prompt, "\n\nArchitecture:\n", architecture, "\n"])
 
     model = make_model(prompt_template, args.model)
 
@@ -1,9 +1,13 @@
 """Simple in-memory audit log for order events."""
 from __future__ import annotations
 
+import time
+from bisect import bisect_left
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence
+
+_EPOCH = datetime(1970, 1, 1)
 
 
 @dataclass
@@ -15,20 +19,73 @@ class AuditEntry:
     at: datetime
 
 
+@dataclass(frozen=True, slots=True)
+class AuditEvent:
+    event: str
+    account_id: str
+    sku: Optional[str]
+    details: str
+
+
 class AuditLogger:
     def __init__(self) -> None:
-        self._entries: List[AuditEntry] = []
+        # Column-wise storage; AuditEntry objects are only built when read back.
+        # Timestamps are ns since the epoch and never decrease, so they can be bisected.
+        self._ts: List[int] = []
+        self._events: List[str] = []
+        self._accounts: List[str] = []
+        self._skus: List[Optional[str]] = []
+        self._details: List[str] = []
 
     def log(self, event: str, account_id: str, sku: Optional[str], details: str) -> None:
-        self._entries.append(
+        now = time.time_ns()
+        if self._ts and now < self._ts[-1]:
+            now = self._ts[-1]
+        self._ts.append(now)
+        self._events.append(event)
+        self._accounts.append(account_id)
+        self._skus.append(sku)
+        self._details.append(details)
+
+    def log_batch(self, events: Sequence[AuditEvent]) -> None:
+        """Record several related events under one timestamp."""
+        if not events:
+            return
+        now = time.time_ns()
+        if self._ts and now < self._ts[-1]:
+            now = self._ts[-1]
+        ts, names, accounts, skus, details = (
+            self._ts, self._events, self._accounts, self._skus, self._details
+        )
+        for entry in events:
+            ts.append(now)
+            names.append(entry.event)
+            accounts.append(entry.account_id)
+            skus.append(entry.sku)
+            details.append(entry.details)
+
+    def entries(self) -> List[AuditEntry]:
+        return self._materialize(0)
+
+    def entries_since(self, ns: int) -> List[AuditEntry]:
+        """Return entries logged at or after ``ns`` (nanoseconds since the epoch)."""
+        return self._materialize(bisect_left(self._ts, ns))
+
+    def _materialize(self, start: int) -> List[AuditEntry]:
+        return [
             AuditEntry(
                 event=event,
                 account_id=account_id,
                 sku=sku,
                 details=details,
-                at=datetime.utcnow(),
+                # Naive UTC, matching what datetime.utcnow() used to record.
+                at=_EPOCH + timedelta(microseconds=ts // 1000),
             )
-        )
-
-    def entries(self) -> List[AuditEntry]:
-        return list(self._entries)
+            for ts, event, account_id, sku, details in zip(
+                self._ts[start:],
+                self._events[start:],
+                self._accounts[start:],
+                self._skus[start:],
+                self._details[start:],
+            )
+        ]
@@ -1,19 +1,32 @@
 """Product catalog with pricing metadata used by pricing and shipping."""
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from typing import Dict, Optional
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Product:
     sku: str
     name: str
-    price: float
-    weight_kg: float
+    price_cents: int
+    weight_g: int
     category: str
     is_fragile: bool = False
 
+    def __post_init__(self) -> None:
+        # Few distinct categories across many products; share one string object each.
+        object.__setattr__(self, "category", sys.intern(self.category))
+
+    @property
+    def price(self) -> float:
+        return self.price_cents / 100
+
+    @property
+    def weight_kg(self) -> float:
+        return self.weight_g / 1000
+
 
 class CatalogService:
     def __init__(self, products: Optional[Dict[str, Product]] = None) -> None:
@@ -21,23 +34,23 @@ class CatalogService:
             "widget-basic": Product(
                 sku="widget-basic",
                 name="Basic Widget",
-                price=25.0,
-                weight_kg=0.4,
+                price_cents=2500,
+                weight_g=400,
                 category="widgets",
             ),
             "widget-pro": Product(
                 sku="widget-pro",
                 name="Pro Widget",
-                price=60.0,
-                weight_kg=0.8,
+                price_cents=6000,
+                weight_g=800,
                 category="widgets",
                 is_fragile=True,
             ),
             "bolt-pack": Product(
                 sku="bolt-pack",
                 name="Bolt Pack (100x)",
-                price=15.0,
-                weight_kg=0.3,
+                price_cents=1500,
+                weight_g=300,
                 category="hardware",
             ),
         }
@@ -19,23 +19,43 @@ class RiskAssessment:
         return 0.5 <= self.score < 0.8
 
 
-class FraudService:
-    """Toy fraud model based on region and order amount."""
+# Rule bits used to index the precomputed score/reason tables.
+_HIGH_AMOUNT = 1
+_UNSUPPORTED_REGION = 2
+_INVALID_AMOUNT = 4
 
-    def score(self, order_total: float, region: str) -> RiskAssessment:
+
+def _build_rule_tables() -> tuple[tuple[float, ...], tuple[Optional[str], ...]]:
+    """Evaluate the scoring rules once for every combination of triggered rules."""
+    scores: list[float] = []
+    reasons: list[Optional[str]] = []
+    for mask in range(8):
         score = 0.1
         reason = None
-
-        if order_total > 500:
+        if mask & _HIGH_AMOUNT:
             score += 0.4
             reason = "high_amount"
-
-        if region not in {"US", "EU", "UK"}:
+        if mask & _UNSUPPORTED_REGION:
             score += 0.3
             reason = "unsupported_region" if not reason else f"{reason}+unsupported_region"
-
-        if order_total <= 0:
+        if mask & _INVALID_AMOUNT:
             score += 0.2
             reason = "invalid_amount"
+        scores.append(score)
+        reasons.append(reason)
+    return tuple(scores), tuple(reasons)
 
-        return RiskAssessment(score=score, reason=reason)
+
+class FraudService:
+    """Toy fraud model based on region and order amount."""
+
+    SUPPORTED_REGIONS = frozenset({"US", "EU", "UK"})
+    _SCORES, _REASONS = _build_rule_tables()
+
+    def score(self, order_total: float, region: str) -> RiskAssessment:
+        mask = (
+            (order_total > 500) * _HIGH_AMOUNT
+            | (region not in self.SUPPORTED_REGIONS) * _UNSUPPORTED_REGION
+            | (order_total <= 0) * _INVALID_AMOUNT
+        )
+        return RiskAssessment(score=self._SCORES[mask], reason=self._REASONS[mask])
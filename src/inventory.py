@@ -1,45 +1,53 @@
 """Inventory domain objects and storage access."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict
-
-
-@dataclass
-class InventoryItem:
-    sku: str
-    quantity: int
+from array import array
+from itertools import compress
+from typing import Dict, List
 
 
 class InventoryRepository:
-    """In-memory inventory store used by the order service demo."""
+    """In-memory inventory store used by the order service demo.
+
+    Stock is stored column-wise: a SKU -> slot map plus one contiguous array of
+    quantities, so bulk scans walk a flat buffer instead of one object per SKU.
+    """
 
     def __init__(self) -> None:
-        self._items: Dict[str, InventoryItem] = {}
+        self._index: Dict[str, int] = {}
+        self._skus: List[str] = []
+        self._quantities = array("q")
 
     def add_item(self, sku: str, quantity: int) -> None:
-        if sku in self._items:
-            self._items[sku].quantity += quantity
+        idx = self._index.get(sku)
+        if idx is None:
+            self._index[sku] = len(self._skus)
+            self._skus.append(sku)
+            self._quantities.append(quantity)
         else:
-            self._items[sku] = InventoryItem(sku=sku, quantity=quantity)
+            self._quantities[idx] += quantity
 
     def remove_item(self, sku: str, quantity: int) -> None:
         if not self.has_enough(sku, quantity):
             raise ValueError(f"Not enough stock for {sku}")
-        self._items[sku].quantity -= quantity
+        self._quantities[self._index[sku]] -= quantity
 
     def reserve_with_buffer(self, sku: str, quantity: int, safety_buffer: int) -> bool:
         """Reserve inventory only if enough quantity remains after a safety buffer."""
         required = quantity + max(safety_buffer, 0)
         if not self.has_enough(sku, required):
             return False
-        self._items[sku].quantity -= quantity
+        self._quantities[self._index[sku]] -= quantity
         return True
 
     def has_enough(self, sku: str, quantity: int) -> bool:
-        item = self._items.get(sku)
-        return bool(item and item.quantity >= quantity)
+        idx = self._index.get(sku)
+        return idx is not None and self._quantities[idx] >= quantity
 
     def get_quantity(self, sku: str) -> int:
-        item = self._items.get(sku)
-        return item.quantity if item else 0
+        idx = self._index.get(sku)
+        return self._quantities[idx] if idx is not None else 0
+
+    def low_stock(self, threshold: int) -> List[str]:
+        """Return every SKU whose quantity is below ``threshold``, in insertion order."""
+        return list(compress(self._skus, map(threshold.__gt__, self._quantities)))
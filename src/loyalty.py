@@ -1,10 +1,12 @@
 """Loyalty program tracking simple point accrual and redemption."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, List, Sequence
 
 
 class LoyaltyService:
+    __slots__ = ("_balances",)
+
     def __init__(self) -> None:
         self._balances: Dict[str, int] = {}
 
@@ -13,14 +15,28 @@ class LoyaltyService:
         self._balances[account_id] = self._balances.get(account_id, 0) + points
         return points
 
+    def accrue_points_batch(self, account_ids: Sequence[str], order_totals: Sequence[float]) -> List[int]:
+        """Accrue points for many orders at once; returns the points awarded per order."""
+        if len(account_ids) != len(order_totals):
+            raise ValueError("account_ids and order_totals must have the same length")
+        points = list(map(int, order_totals))
+        balances = self._balances
+        current = balances.get
+        for account_id, awarded in zip(account_ids, points):
+            balances[account_id] = current(account_id, 0) + awarded
+        return points
+
     def get_balance(self, account_id: str) -> int:
         return self._balances.get(account_id, 0)
 
     def redeem(self, account_id: str, points: int) -> float:
-        available = self.get_balance(account_id)
+        available = self._balances.get(account_id, 0)
         if points > available:
             raise ValueError("Not enough points to redeem")
         self._balances[account_id] = available - points
+        return self.points_value(points)
+
+    def points_value(self, points: int) -> float:
         # Convert points to a fixed monetary value.
         return round(points * 0.01, 2)
 
@@ -31,7 +47,7 @@ class LoyaltyService:
 
     def clawback(self, account_id: str, points: int) -> None:
         # Remove points when an order is refunded or fails after accrual.
-        if points <= 0:
+        current = self._balances.get(account_id)
+        if points <= 0 or current is None:
             return
-        current = self._balances.get(account_id, 0)
         self._balances[account_id] = max(0, current - points)
@@ -0,0 +1,22 @@
+"""Fixed-point money helpers; amounts are carried as integer cents internally."""
+from __future__ import annotations
+
+
+def to_cents(amount: float) -> int:
+    """Convert a dollar amount to whole cents."""
+    return int(round(amount * 100))
+
+
+def percent_of(cents: int, percent: int) -> int:
+    """Return ``percent``% of ``cents``, rounded half up to a whole cent."""
+    return (cents * percent + 50) // 100
+
+
+def basis_points_of(cents: int, basis_points: int) -> int:
+    """Return ``basis_points``/10000 of ``cents``, rounded half up to a whole cent."""
+    return (cents * basis_points + 5_000) // 10_000
+
+
+def prorate_cents(cents: int, numerator: int, denominator: int) -> int:
+    """Return ``cents * numerator / denominator``, rounded half up to a whole cent."""
+    return (cents * numerator + denominator // 2) // denominator
@@ -1,8 +1,10 @@
 """Order processing logic for the workflow demo."""
 from __future__ import annotations
 
+import inspect
+import sys
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Awaitable, Optional, Protocol, Union
 
 from audit import AuditLogger
 from fraud import FraudService
@@ -13,11 +15,17 @@ from shipping import Address, ShippingLabel, ShippingService
 
 
 class PaymentGateway(Protocol):
+    """Charges customers.
+
+    Gateways may also offer ``refund(account_id, amount)``; OrderService uses it when
+    stock runs out while a charge is in flight, and reports ``refund_failed`` otherwise.
+    """
+
     def charge(self, account_id: str, amount: float) -> None:  # pragma: no cover - demo stub
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     sku: str
     quantity: int
@@ -28,8 +36,15 @@ class Order:
     shipping_address: Address | None = None
     loyalty_points_to_apply: int | None = None
 
+    def __post_init__(self) -> None:
+        # region and coupon_code are interned so the tax/promotion table probes they
+        # feed hit on identity; codes keep their case because results echo them back.
+        self.region = sys.intern(self.region)
+        if self.coupon_code:
+            self.coupon_code = sys.intern(self.coupon_code)
 
-@dataclass
+
+@dataclass(slots=True)
 class OrderResult:
     status: str
     pricing: PricingBreakdown | None = None
@@ -63,50 +78,119 @@ class OrderService:
 
     def place_order(self, order: Order) -> OrderResult:
         """Return fulfillment state after attempting to reserve stock."""
+        screened = self._screen(order)
+        if isinstance(screened, OrderResult):
+            return screened
+        try:
+            self._payment_gateway.charge(order.account_id, screened.total)
+        except Exception as exc:
+            return self._payment_failed(order, screened, exc)
+        if not self._take_stock(order):
+            try:
+                self._refund_charge(order, screened.total)
+            except Exception as exc:
+                return self._refund_failed(order, screened, exc)
+            return self._stock_unavailable(order, screened)
+        return self._fulfil(order, screened)
+
+    async def place_order_async(self, order: Order) -> OrderResult:
+        """Async variant of :meth:`place_order` for gateways whose ``charge``/``refund`` are coroutines.
+
+        Only the gateway is awaited, so other orders interleave while a charge is in
+        flight. The in-memory services are not thread-safe and run directly on the
+        event loop, with no await between checking and taking stock.
+        """
+        screened = self._screen(order)
+        if isinstance(screened, OrderResult):
+            return screened
+        try:
+            pending = self._payment_gateway.charge(order.account_id, screened.total)
+            if inspect.isawaitable(pending):
+                await pending
+        except Exception as exc:
+            return self._payment_failed(order, screened, exc)
+        if not self._take_stock(order):
+            try:
+                pending = self._refund_charge(order, screened.total)
+                if inspect.isawaitable(pending):
+                    await pending
+            except Exception as exc:
+                return self._refund_failed(order, screened, exc)
+            return self._stock_unavailable(order, screened)
+        return self._fulfil(order, screened)
+
+    def _screen(self, order: Order) -> Union[OrderResult, PricingBreakdown]:
+        """Check stock, price, fraud-screen and redeem points for ``order``.
+
+        Returns the pricing to charge, or the terminal result if the order stopped early.
+        """
         required = order.quantity + max(self._safety_stock, 0)
         if not self._inventory.has_enough(order.sku, required):
             return OrderResult(status="insufficient_stock", reason="not_enough_inventory")
 
-        loyalty_credit = None
-        redeemed_points = 0
-        if order.loyalty_points_to_apply:
-            try:
-                redeemed_points = order.loyalty_points_to_apply
-                loyalty_credit = self._loyalty.redeem(order.account_id, redeemed_points)
-            except Exception as exc:
-                return OrderResult(status="loyalty_failed", reason=str(exc))
-
         pricing = self._pricing.calculate(
             sku=order.sku,
             quantity=order.quantity,
             region=order.region,
             coupon_code=order.coupon_code,
             shipping_method=order.shipping_method,
-            apply_loyalty=loyalty_credit,
         )
+        redeemed_points = order.loyalty_points_to_apply or 0
+        if redeemed_points:
+            # Price the credit without redeeming it yet; points are only taken once
+            # fraud review has passed, so rejected orders never touch the balance.
+            credit = self._loyalty.points_value(redeemed_points)
+            pricing = self._pricing.apply_loyalty_credit(pricing, credit)
 
         risk = self._fraud.score(order_total=pricing.total, region=order.region)
         if risk.is_blocked:
-            if redeemed_points:
-                self._loyalty.restore(order.account_id, redeemed_points)
             self._audit.log("order_blocked", order.account_id, order.sku, risk.reason or "blocked")
             return OrderResult(status="blocked", pricing=pricing, reason=risk.reason)
         if risk.needs_review:
-            if redeemed_points:
-                self._loyalty.restore(order.account_id, redeemed_points)
             self._audit.log("order_review", order.account_id, order.sku, risk.reason or "review")
             return OrderResult(status="manual_review", pricing=pricing, reason=risk.reason)
 
-        try:
-            self._payment_gateway.charge(order.account_id, pricing.total)
-        except Exception as exc:
-            if redeemed_points:
-                self._loyalty.restore(order.account_id, redeemed_points)
-            self._audit.log("payment_failed", order.account_id, order.sku, str(exc))
-            return OrderResult(status="payment_failed", pricing=pricing, reason=str(exc))
+        if redeemed_points:
+            try:
+                self._loyalty.redeem(order.account_id, redeemed_points)
+            except Exception as exc:
+                return OrderResult(status="loyalty_failed", reason=str(exc))
+        return pricing
 
-        self._inventory.remove_item(order.sku, order.quantity)
+    def _payment_failed(self, order: Order, pricing: PricingBreakdown, exc: Exception) -> OrderResult:
+        self._loyalty.restore(order.account_id, order.loyalty_points_to_apply or 0)
+        self._audit.log("payment_failed", order.account_id, order.sku, str(exc))
+        return OrderResult(status="payment_failed", pricing=pricing, reason=str(exc))
+
+    def _take_stock(self, order: Order) -> bool:
+        """Remove the ordered stock after a successful charge.
 
+        Returns False if another order took the stock while the charge was in flight;
+        the caller must then refund the charge.
+        """
+        if not self._inventory.has_enough(order.sku, order.quantity):
+            return False
+        self._inventory.remove_item(order.sku, order.quantity)
+        return True
+
+    def _refund_charge(self, order: Order, amount: float) -> Optional[Awaitable[None]]:
+        refund = getattr(self._payment_gateway, "refund", None)
+        if refund is None:
+            raise RuntimeError("payment gateway does not support refunds")
+        return refund(order.account_id, amount)
+
+    def _refund_failed(self, order: Order, pricing: PricingBreakdown, exc: Exception) -> OrderResult:
+        # Charged but unfulfilled and unrefunded: leave a trail for manual follow-up.
+        self._loyalty.restore(order.account_id, order.loyalty_points_to_apply or 0)
+        self._audit.log("refund_failed", order.account_id, order.sku, f"charged={pricing.total}, error={exc}")
+        return OrderResult(status="refund_failed", pricing=pricing, reason=str(exc))
+
+    def _stock_unavailable(self, order: Order, pricing: PricingBreakdown) -> OrderResult:
+        self._loyalty.restore(order.account_id, order.loyalty_points_to_apply or 0)
+        self._audit.log("stock_unavailable", order.account_id, order.sku, f"refunded={pricing.total}")
+        return OrderResult(status="insufficient_stock", pricing=pricing, reason="not_enough_inventory")
+
+    def _fulfil(self, order: Order, pricing: PricingBreakdown) -> OrderResult:
         label = None
         if order.shipping_address:
             label = self._shipping.create_label(
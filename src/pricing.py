@@ -1,15 +1,16 @@
 """Pricing helpers for orders."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from catalog import CatalogService
+from catalog import CatalogService, Product
+from money import basis_points_of, percent_of, prorate_cents, to_cents
 from promotions import PromotionService
 from tax import TaxService
 
 
-@dataclass
+@dataclass(slots=True)
 class PricingBreakdown:
     subtotal: float
     discount: float
@@ -18,19 +19,71 @@ class PricingBreakdown:
     total: float
     coupon_applied: Optional[str] = None
     reason: Optional[str] = None
+    quantity: Optional[int] = None
 
     @property
     def effective_subtotal(self) -> float:
         return max(0.0, self.subtotal - self.discount)
 
+    def prorate(self, quantity: int, start: int = 0) -> PricingBreakdown:
+        """Return the share of this breakdown for units ``start`` up to ``start + quantity``.
+
+        Shares of consecutive unit ranges add up to exactly the original amounts, so
+        partial refunds never exceed what was charged.
+        """
+        if self.quantity is None:
+            raise ValueError("breakdown has no quantity to prorate by")
+        if quantity < 0 or start < 0 or start + quantity > self.quantity:
+            raise ValueError("units to prorate fall outside the priced quantity")
+
+        before = self._share_cents(start)
+        through = self._share_cents(start + quantity)
+        subtotal, discount, tax, shipping, total = (b - a for a, b in zip(before, through))
+        return PricingBreakdown(
+            subtotal=subtotal / 100,
+            discount=discount / 100,
+            tax=tax / 100,
+            shipping=shipping / 100,
+            total=total / 100,
+            coupon_applied=self.coupon_applied,
+            reason=self.reason,
+            quantity=quantity,
+        )
+
+    def _share_cents(self, units: int) -> Tuple[int, int, int, int, int]:
+        """Cents of (subtotal, discount, tax, shipping, total) owed for the first ``units``.
+
+        The total is prorated once and split over the components by largest remainder,
+        so the components still add up to it.
+        """
+        ordered = self.quantity
+        subtotal, discount, tax, shipping, total = map(
+            to_cents, (self.subtotal, self.discount, self.tax, self.shipping, self.total)
+        )
+        # The discount is a negative part; it can't take the subtotal below zero.
+        parts = (subtotal, -min(discount, subtotal), tax, shipping)
+        shares = [part * units // ordered for part in parts]
+        leftover = prorate_cents(sum(parts), units, ordered) - sum(shares)
+        by_remainder = sorted(range(len(parts)), key=lambda i: parts[i] * units % ordered, reverse=True)
+        for i in by_remainder[:leftover]:
+            shares[i] += 1
+        subtotal_share, discount_share, tax_share, shipping_share = shares
+        if discount > subtotal:
+            discount_share = -prorate_cents(discount, units, ordered)
+        return subtotal_share, -discount_share, tax_share, shipping_share, prorate_cents(total, units, ordered)
+
 
 class PricingService:
     """Calculates order totals using catalog, promotions, tax, and shipping rules."""
 
+    # Source of truth for base shipping; __init__ converts it to cents once and
+    # calculate() only probes that table, so never rebuild a dict per call.
     SHIPPING_BY_METHOD = {
         "standard": 5.00,
         "express": 12.00,
     }
+    # Extra shipping for bulk orders, indexed by quantity band (<10, 10-19, 20+).
+    BULK_SHIPPING_SURCHARGE = (0.00, 3.00, 6.00)
 
     def __init__(
         self,
@@ -41,15 +94,23 @@ class PricingService:
         self._catalog = catalog
         self._promotions = promotions
         self._tax = tax
-
-    def _bulk_discount(self, product, quantity: int) -> float:
+        # (method, quantity band) -> shipping cents, so calculate() does one probe.
+        # Unknown methods still pay the bulk surcharge alone.
+        self._bulk_shipping_cents = tuple(to_cents(cost) for cost in self.BULK_SHIPPING_SURCHARGE)
+        self._shipping_cents = {
+            (method, band): to_cents(cost) + surcharge
+            for method, cost in self.SHIPPING_BY_METHOD.items()
+            for band, surcharge in enumerate(self._bulk_shipping_cents)
+        }
+
+    def _bulk_discount(self, subtotal_cents: int, quantity: int) -> int:
         if quantity >= 20:
-            return round(product.price * quantity * 0.15, 2)
+            return percent_of(subtotal_cents, 15)
         if quantity >= 10:
-            return round(product.price * quantity * 0.12, 2)
+            return percent_of(subtotal_cents, 12)
         if quantity >= 5:
-            return round(product.price * quantity * 0.07, 2)
-        return 0.0
+            return percent_of(subtotal_cents, 7)
+        return 0
 
     def calculate(
         self,
@@ -63,34 +124,101 @@ class PricingService:
         if quantity <= 0:
             raise ValueError("Quantity must be positive")
 
+        # All arithmetic below is in integer cents; dollars appear only in the result.
         product = self._catalog.get(sku)
-        subtotal = product.price * quantity
-
-        promo = self._promotions.apply_coupon(product, quantity, coupon_code)
-        category_discount = self._promotions.category_discount(product)
-        bulk_discount = self._bulk_discount(product, quantity)
-        discount = promo.discount + (category_discount * quantity) + bulk_discount
-
-        base_shipping = self.SHIPPING_BY_METHOD.get(shipping_method, 0.0)
-        bulk_shipping = 0.0
-        if quantity >= 20:
-            bulk_shipping = 6.0
-        elif quantity >= 10:
-            bulk_shipping = 3.0
-        shipping = 0.0 if promo.free_shipping else base_shipping + bulk_shipping
-        taxable_amount = max(0.0, subtotal - discount) + shipping
-        tax_breakdown = self._tax.calculate(taxable_amount, region, category=product.category)
-
-        total = taxable_amount + tax_breakdown.amount
+        subtotal = product.price_cents * quantity
+
+        category_discount = self._promotions.category_discount_cents(product)
+        if not coupon_code and quantity < 5:
+            # Most orders: no coupon, no bulk discount and the lowest shipping band,
+            # so skip promotion evaluation and the bulk ladders entirely.
+            discount = category_discount * quantity
+            shipping = self._shipping_cents.get((shipping_method, 0), self._bulk_shipping_cents[0])
+            taxable_amount = max(0, subtotal - discount) + shipping
+            tax = basis_points_of(taxable_amount, self._tax.basis_points(region, product.category))
+            coupon_applied = reason = None
+        else:
+            promo = self._promotions.apply_coupon(product, quantity, coupon_code)
+            bulk_discount = self._bulk_discount(subtotal, quantity)
+            discount = promo.discount_cents + (category_discount * quantity) + bulk_discount
+
+            band = (quantity >= 20) + (quantity >= 10)
+            shipping = 0
+            if not promo.free_shipping:
+                shipping = self._shipping_cents.get((shipping_method, band), self._bulk_shipping_cents[band])
+            taxable_amount = max(0, subtotal - discount) + shipping
+            tax = self._tax.calculate_cents(taxable_amount, region, category=product.category).amount_cents
+            coupon_applied, reason = promo.applied_code, promo.reason
+
+        total = taxable_amount + tax
         if apply_loyalty:
-            total = max(0.0, total - apply_loyalty)
+            total = max(0, total - to_cents(apply_loyalty))
 
         return PricingBreakdown(
-            subtotal=subtotal,
-            discount=round(discount, 2),
-            tax=round(tax_breakdown.amount, 2),
-            shipping=shipping,
-            total=round(total, 2),
-            coupon_applied=promo.applied_code,
-            reason=promo.reason,
+            subtotal=subtotal / 100,
+            discount=discount / 100,
+            tax=tax / 100,
+            shipping=shipping / 100,
+            total=total / 100,
+            coupon_applied=coupon_applied,
+            reason=reason,
+            quantity=quantity,
+        )
+
+    def apply_loyalty_credit(self, pricing: PricingBreakdown, credit: float) -> PricingBreakdown:
+        """Return ``pricing`` with a loyalty credit taken off the total, as ``calculate`` would."""
+        if not credit:
+            return pricing
+        return replace(pricing, total=max(0, to_cents(pricing.total) - to_cents(credit)) / 100)
+
+    def calculate_batch(
+        self,
+        skus: Sequence[str],
+        quantities: Sequence[int],
+        regions: Sequence[str],
+        shipping_method: str = "standard",
+    ) -> List[PricingBreakdown]:
+        """Price many orders without coupons or loyalty credit, e.g. for re-pricing.
+
+        Each row matches :meth:`calculate` with ``coupon_code=None`` and
+        ``apply_loyalty=None``; products and tax rates are looked up once per batch.
+        """
+        if not len(skus) == len(quantities) == len(regions):
+            raise ValueError("skus, quantities and regions must have the same length")
+
+        products: Dict[str, Tuple[Product, int]] = {}
+        tax_rates: Dict[Tuple[str, str], int] = {}
+        shipping_by_band = tuple(
+            self._shipping_cents.get((shipping_method, band), surcharge)
+            for band, surcharge in enumerate(self._bulk_shipping_cents)
         )
+        results: List[PricingBreakdown] = []
+        for sku, quantity, region in zip(skus, quantities, regions):
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive")
+            entry = products.get(sku)
+            if entry is None:
+                product = self._catalog.get(sku)
+                entry = products[sku] = (product, self._promotions.category_discount_cents(product))
+            product, category_discount = entry
+            rate_key = (region, product.category)
+            basis_points = tax_rates.get(rate_key)
+            if basis_points is None:
+                basis_points = tax_rates[rate_key] = self._tax.basis_points(region, product.category)
+
+            subtotal = product.price_cents * quantity
+            discount = category_discount * quantity + self._bulk_discount(subtotal, quantity)
+            shipping = shipping_by_band[(quantity >= 20) + (quantity >= 10)]
+            taxable_amount = max(0, subtotal - discount) + shipping
+            tax = basis_points_of(taxable_amount, basis_points)
+            results.append(
+                PricingBreakdown(
+                    subtotal=subtotal / 100,
+                    discount=discount / 100,
+                    tax=tax / 100,
+                    shipping=shipping / 100,
+                    total=(taxable_amount + tax) / 100,
+                    quantity=quantity,
+                )
+            )
+        return results
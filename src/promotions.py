@@ -2,40 +2,71 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, Optional
 
 from catalog import Product
+from money import percent_of
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PromotionResult:
-    discount: float = 0.0
+    discount_cents: int = 0
     free_shipping: bool = False
     applied_code: Optional[str] = None
     reason: Optional[str] = None
 
+    @property
+    def discount(self) -> float:
+        return self.discount_cents / 100
+
+
+# Shared results for the no-coupon and coupon-not-applied cases; safe because frozen.
+_EMPTY_PROMO = PromotionResult()
+_UNAPPLIED_PROMO = PromotionResult(discount_cents=0, applied_code=None, reason="coupon_not_applied")
+
+
+def _save10(product: Product, quantity: int, coupon_code: str) -> PromotionResult:
+    discount = min(percent_of(product.price_cents * quantity, 10), 2500)
+    return PromotionResult(discount_cents=discount, applied_code=coupon_code)
+
+
+def _freeship(product: Product, quantity: int, coupon_code: str) -> PromotionResult:
+    return PromotionResult(free_shipping=True, applied_code=coupon_code)
+
+
+def _bogo(product: Product, quantity: int, coupon_code: str) -> PromotionResult:
+    if quantity < 2:
+        return _UNAPPLIED_PROMO
+    # Buy one get one free on the same SKU.
+    return PromotionResult(discount_cents=product.price_cents, applied_code=coupon_code)
+
+
+# Keyed by lower-cased code; built once at import.
+_COUPON_HANDLERS: Dict[str, Callable[[Product, int, str], PromotionResult]] = {
+    "save10": _save10,
+    "freeship": _freeship,
+    "bogo": _bogo,
+}
+
 
 class PromotionService:
     """Evaluates coupons and simple product/category promotions."""
 
     def apply_coupon(self, product: Product, quantity: int, coupon_code: Optional[str]) -> PromotionResult:
         if not coupon_code:
-            return PromotionResult()
-
-        code = coupon_code.lower()
-        if code == "save10":
-            discount = min(product.price * quantity * 0.10, 25.0)
-            return PromotionResult(discount=round(discount, 2), applied_code=coupon_code)
-        if code == "freeship":
-            return PromotionResult(free_shipping=True, applied_code=coupon_code)
-        if code == "bogo" and quantity >= 2:
-            # Buy one get one free on the same SKU.
-            return PromotionResult(discount=product.price, applied_code=coupon_code)
+            return _EMPTY_PROMO
 
-        return PromotionResult(discount=0.0, applied_code=None, reason="coupon_not_applied")
+        # Canonical (already lower-case) codes skip the .lower() copy.
+        handler = _COUPON_HANDLERS.get(coupon_code) or _COUPON_HANDLERS.get(coupon_code.lower())
+        if handler is None:
+            return _UNAPPLIED_PROMO
+        return handler(product, quantity, coupon_code)
 
     def category_discount(self, product: Product) -> float:
+        return self.category_discount_cents(product) / 100
+
+    def category_discount_cents(self, product: Product) -> int:
         # Example: 5% off hardware items.
         if product.category == "hardware":
-            return round(product.price * 0.05, 2)
-        return 0.0
+            return percent_of(product.price_cents, 5)
+        return 0
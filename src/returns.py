@@ -1,8 +1,10 @@
 """Return and refund processing flow."""
 from __future__ import annotations
 
+import inspect
+import sys
 from dataclasses import dataclass
-from typing import Optional, Protocol
+from typing import Dict, Optional, Protocol, Union
 
 from audit import AuditLogger
 from inventory import InventoryRepository
@@ -16,7 +18,7 @@ class RefundGateway(Protocol):
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class ReturnRequest:
     account_id: str
     order_id: str
@@ -26,8 +28,12 @@ class ReturnRequest:
     reason: str
     shipping_address: Address
 
+    def __post_init__(self) -> None:
+        # Interned so tax-table probes on region hit on identity.
+        self.region = sys.intern(self.region)
 
-@dataclass
+
+@dataclass(slots=True)
 class ReturnResult:
     status: str
     refund: Optional[PricingBreakdown] = None
@@ -50,28 +56,78 @@ class ReturnService:
         self._shipping = shipping
         self._loyalty = loyalty
         self._audit = audit
-
-    def process(self, request: ReturnRequest) -> ReturnResult:
-        if request.quantity <= 0:
-            return ReturnResult(status="rejected", reason="invalid_quantity")
-
+        # Units already refunded per order when prorating from the original pricing.
+        self._returned_units: Dict[str, int] = {}
+
+    def process(self, request: ReturnRequest, original_pricing: Optional[PricingBreakdown] = None) -> ReturnResult:
+        """Refund ``request``.
+
+        When the order's ``original_pricing`` is supplied the refund is prorated from it
+        instead of re-running the pricing pipeline.
+        """
+        outcome = self._quote(request, original_pricing)
+        if isinstance(outcome, ReturnResult):
+            return outcome
         try:
-            refund_breakdown = self._pricing.calculate(
-                sku=request.sku,
-                quantity=request.quantity,
-                region=request.region,
-                coupon_code=None,
-                shipping_method="standard",
-                apply_loyalty=None,
-            )
-        except Exception as exc:
-            return ReturnResult(status="rejected", reason=str(exc))
-
+            self._refund_gateway.refund(request.account_id, outcome.total)
+        except Exception as exc:  # pragma: no cover - demo stub
+            return ReturnResult(status="payment_failed", refund=outcome, reason=str(exc))
+        return self._settle(request, outcome, original_pricing)
+
+    async def process_async(
+        self, request: ReturnRequest, original_pricing: Optional[PricingBreakdown] = None
+    ) -> ReturnResult:
+        """Async variant of :meth:`process` for refund gateways whose ``refund`` is a coroutine.
+
+        Only the gateway is awaited; restocking, the clawback and the return label run
+        directly on the event loop because the in-memory services are not thread-safe.
+        """
+        outcome = self._quote(request, original_pricing)
+        if isinstance(outcome, ReturnResult):
+            return outcome
         try:
-            self._refund_gateway.refund(request.account_id, refund_breakdown.total)
+            pending = self._refund_gateway.refund(request.account_id, outcome.total)
+            if inspect.isawaitable(pending):
+                await pending
         except Exception as exc:  # pragma: no cover - demo stub
-            return ReturnResult(status="payment_failed", refund=refund_breakdown, reason=str(exc))
+            return ReturnResult(status="payment_failed", refund=outcome, reason=str(exc))
+        return self._settle(request, outcome, original_pricing)
 
+    def _quote(
+        self, request: ReturnRequest, original_pricing: Optional[PricingBreakdown]
+    ) -> Union[ReturnResult, PricingBreakdown]:
+        """Price the refund for ``request``; returns it, or the result if it was rejected."""
+        if request.quantity <= 0:
+            return ReturnResult(status="rejected", reason="invalid_quantity")
+
+        if original_pricing is not None and original_pricing.quantity:
+            returned = self._returned_units.get(request.order_id, 0)
+            if returned + request.quantity > original_pricing.quantity:
+                return ReturnResult(status="rejected", reason="quantity_exceeds_order")
+            refund_breakdown = original_pricing.prorate(request.quantity, start=returned)
+        else:
+            try:
+                refund_breakdown = self._pricing.calculate(
+                    sku=request.sku,
+                    quantity=request.quantity,
+                    region=request.region,
+                    coupon_code=None,
+                    shipping_method="standard",
+                    apply_loyalty=None,
+                )
+            except Exception as exc:
+                return ReturnResult(status="rejected", reason=str(exc))
+
+        return refund_breakdown
+
+    def _settle(
+        self,
+        request: ReturnRequest,
+        refund_breakdown: PricingBreakdown,
+        original_pricing: Optional[PricingBreakdown],
+    ) -> ReturnResult:
+        if original_pricing is not None and original_pricing.quantity:
+            self._returned_units[request.order_id] = self._returned_units.get(request.order_id, 0) + request.quantity
         self._inventory.add_item(request.sku, request.quantity)
         self._loyalty.clawback(request.account_id, int(refund_breakdown.total))
 
@@ -4,8 +4,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
+_SUPPORTED_METHODS: frozenset[str] = frozenset(("standard", "express"))
+_METHOD_COST: dict[str, float] = {"standard": 5.0, "express": 12.0}
 
-@dataclass
+
+@dataclass(slots=True)
 class Address:
     name: str
     line1: str
@@ -15,7 +18,7 @@ class Address:
     country: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ShippingLabel:
     order_id: str
     carrier: str
@@ -42,7 +45,7 @@ class ShippingService:
             raise ValueError(f"Unsupported shipping method: {method}")
 
         tracking = f"{carrier}-{order_id}-TRACK"
-        cost = 5.0 if method == "standard" else 12.0
+        cost = _METHOD_COST[method]
         label = ShippingLabel(
             order_id=order_id,
             carrier=carrier,
@@ -55,7 +58,7 @@ class ShippingService:
         return label
 
     def _is_supported(self, method: str) -> bool:
-        return method in {"standard", "express"}
+        return method in _SUPPORTED_METHODS
 
     def get_label(self, order_id: str) -> Optional[ShippingLabel]:
         return self._issued.get(order_id)
@@ -2,16 +2,22 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Tuple
 
+from money import basis_points_of, to_cents
 
-@dataclass
+
+@dataclass(slots=True)
 class TaxBreakdown:
     rate: float
-    amount: float
+    amount_cents: int
     region: str
     category: str
 
+    @property
+    def amount(self) -> float:
+        return self.amount_cents / 100
+
 
 class TaxService:
     REGIONAL_RATES: Dict[str, Dict[str, float]] = {
@@ -19,9 +25,39 @@ class TaxService:
         "EU": {"default": 0.20},
         "UK": {"default": 0.17},
     }
+    # Rate for regions missing from REGIONAL_RATES (fraud review flags those orders).
+    UNKNOWN_REGION_RATE = 0.0
+
+    def __init__(self) -> None:
+        # REGIONAL_RATES stays the editable source; flatten it once so a lookup is a
+        # single (region, category) probe in the common case. Each entry carries the
+        # rate alongside its integer basis points for cent arithmetic.
+        self._flat_rates: Dict[Tuple[str, str], Tuple[float, int]] = {}
+        self._default_rates: Dict[str, Tuple[float, int]] = {}
+        self._unknown_rate = (self.UNKNOWN_REGION_RATE, round(self.UNKNOWN_REGION_RATE * 10_000))
+        for region, rates in self.REGIONAL_RATES.items():
+            for category, rate in rates.items():
+                self._flat_rates[(region, category)] = (rate, round(rate * 10_000))
+            self._default_rates[region] = self._flat_rates.get((region, "default"), self._unknown_rate)
 
     def calculate(self, taxable_amount: float, region: str, category: str = "default") -> TaxBreakdown:
-        region_rates = self.REGIONAL_RATES.get(region, {"default": 0.0})
-        rate = region_rates.get(category, region_rates.get("default", 0.0))
-        amount = taxable_amount * rate
-        return TaxBreakdown(rate=rate, amount=amount, region=region, category=category)
+        return self.calculate_cents(to_cents(taxable_amount), region, category)
+
+    def calculate_cents(self, taxable_cents: int, region: str, category: str = "default") -> TaxBreakdown:
+        rate, basis_points = self._lookup(region, category)
+        return TaxBreakdown(
+            rate=rate,
+            amount_cents=basis_points_of(taxable_cents, basis_points),
+            region=region,
+            category=category,
+        )
+
+    def basis_points(self, region: str, category: str = "default") -> int:
+        """Return the rate that applies to ``region``/``category`` in basis points."""
+        return self._lookup(region, category)[1]
+
+    def _lookup(self, region: str, category: str) -> Tuple[float, int]:
+        entry = self._flat_rates.get((region, category))
+        if entry is None:
+            entry = self._default_rates.get(region, self._unknown_rate)
+        return entry
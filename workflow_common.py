@@ -0,0 +1,291 @@
+"""
+Repo context and read-only tools shared by the tool-calling workflows.
+
+Both `langgraph_workflow.py` and `openai_workflow.py` seed the model with the
+same git context and expose the same ls/cat/rg tools; only the SDK-specific
+tool schemas and the model loop live in the workflow scripts.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent
+ROOT_STR = str(ROOT)
+ROOT_PREFIX = os.path.join(ROOT_STR, "")
+ARTIFACTS_DIR = ROOT / "reports"
+MAX_READ_LENGTH = 1_000_000
+# Only reads up to this size are cached, so the read cache holds at most
+# _read_file_cached's maxsize * MAX_CACHED_READ bytes (8 MiB).
+MAX_CACHED_READ = 64 * 1024
+MAX_SEARCH_CHARS = 8000
+# Let ripgrep bound its own output; MAX_SEARCH_CHARS in search_text is only a safety net.
+RG_ARGS = (
+    "rg",
+    "-n",
+    "--no-messages",
+    "--max-count", "200",
+    "--max-columns", "300",
+    "--max-filesize", "10M",
+    "-j", str(os.cpu_count() or 4),
+)
+
+
+@dataclass(frozen=True)
+class GitContext:
+    status: str
+    diff: str
+    changed_files: List[str]
+    repo_tree: str
+
+
+def run_git(*args: str) -> str:
+    allow_non_zero = args and args[0] == "diff"
+    result = subprocess.run(["git", *args], capture_output=True, text=True)
+    if result.returncode not in (0, 1) or (result.returncode == 1 and not allow_non_zero):
+        raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+    return result.stdout.strip()
+
+
+def run_git_many(*commands: tuple[str, ...]) -> List[str]:
+    """Run independent git commands concurrently and return their outputs in order."""
+    with ThreadPoolExecutor(max_workers=len(commands)) as pool:
+        return list(pool.map(lambda args: run_git(*args), commands))
+
+
+def parse_porcelain_status(raw: str) -> tuple[str, List[str], List[str]]:
+    """Split `git status --porcelain=v1 -z -b` output into (status, changed, untracked).
+
+    `status` is rendered like `git status -sb`; `changed` lists paths with unstaged
+    worktree changes (what `git diff --name-only` reports).
+    """
+    lines: List[str] = []
+    changed: List[str] = []
+    untracked: List[str] = []
+    entries = iter(raw.split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        if entry.startswith("## "):
+            lines.append(entry)
+            continue
+        code, path = entry[:2], entry[3:]
+        if code[0] in "RC" or code[1] in "RC":
+            # -z emits the rename source as a separate NUL-terminated field.
+            lines.append(f"{code} {next(entries, '')} -> {path}")
+        else:
+            lines.append(entry)
+        if code == "??":
+            untracked.append(path)
+        elif code[1] != " ":
+            changed.append(path)
+    return "\n".join(lines), changed, untracked
+
+
+def _repo_top() -> Path:
+    """Return the worktree root containing the cwd (porcelain paths are relative to it)."""
+    cwd = Path.cwd()
+    for candidate in (cwd, *cwd.parents):
+        if (candidate / ".git").exists():
+            return candidate
+    return cwd
+
+
+def _new_file_diff(top: Path, path: str) -> str:
+    """Render an untracked file as a `git diff` new-file patch without spawning git."""
+    full = top / path
+    header = f"diff --git a/{path} b/{path}\n"
+    if full.is_symlink():
+        mode, data = "120000", os.readlink(full).encode()
+    else:
+        mode = "100755" if os.access(full, os.X_OK) else "100644"
+        data = full.read_bytes()
+    header += f"new file mode {mode}\n"
+    if not data:
+        return header.rstrip("\n")
+    if b"\0" in data[:8000]:
+        return f"{header}Binary files /dev/null and b/{path} differ"
+
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    if lines[-1] == "":
+        lines.pop()
+    span = "1" if len(lines) == 1 else f"1,{len(lines)}"
+    parts = [header, f"--- /dev/null\n+++ b/{path}\n@@ -0,0 +{span} @@\n"]
+    parts.extend(f"+{line}\n" for line in lines)
+    if not data.endswith(b"\n"):
+        parts.append("\\ No newline at end of file\n")
+    return "".join(parts).rstrip("\n")
+
+
+def gather_context() -> GitContext:
+    """Collect the repo tree, status and diff with three concurrent git calls."""
+    tracked, raw_status, diff_output = run_git_many(
+        ("ls-files",),
+        ("status", "--porcelain=v1", "-z", "-uall", "-b"),
+        ("diff", "--no-color"),
+    )
+    status, changed_files, untracked = parse_porcelain_status(raw_status)
+    if untracked:
+        top = _repo_top()
+        pieces = [diff_output] if diff_output else []
+        for path in untracked:
+            # Nested repos show up as "dir/"; entries can also vanish or become
+            # unreadable after the status call. Skip those rather than abort.
+            if path.endswith("/") or (top / path).is_dir():
+                continue
+            try:
+                pieces.append(_new_file_diff(top, path))
+            except OSError:
+                continue
+        diff_output = "\n".join(pieces)
+        changed_files.extend(untracked)
+
+    # Keep git's own ordering (tracked changes, then untracked); only drop dupes/blanks.
+    changed_files = list(dict.fromkeys(filter(None, changed_files)))
+    return GitContext(
+        status=status,
+        diff=diff_output.strip(),
+        changed_files=changed_files,
+        repo_tree=tracked or "<no tracked files>",
+    )
+
+
+def safe_resolve(path: str) -> Path:
+    return _resolve_cached(path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_cached(path: str) -> Path:
+    # ROOT is fixed for the process, so a resolved relative path stays valid across tool calls.
+    target = (ROOT / path).resolve()
+    # Both sides are resolved, so a string prefix check is equivalent to walking target.parents.
+    target_str = str(target)
+    if target_str != ROOT_STR and not target_str.startswith(ROOT_PREFIX):
+        raise ValueError("Access outside repo root is not allowed")
+    return target
+
+
+def tool_list_dir(path: str = ".") -> str:
+    try:
+        p = safe_resolve(path)
+        return _list_dir_cached(p, p.stat().st_mtime_ns)
+    except Exception as exc:  # pragma: no cover - defensive
+        return f"<ls error: {exc}>"
+
+
+@functools.lru_cache(maxsize=256)
+def _list_dir_cached(p: Path, mtime_ns: int) -> str:
+    entries = sorted(x.name + ("/" if x.is_dir() else "") for x in p.iterdir())
+    return "\n".join(entries)
+
+
+def tool_read_file(path: str, start: int = 0, length: int = 4000) -> str:
+    try:
+        p = safe_resolve(path)
+        start = max(int(start), 0)
+        length = min(max(int(length), 0), MAX_READ_LENGTH)
+        st = p.stat()
+        if not length or start >= st.st_size:
+            return ""
+        if length > MAX_CACHED_READ:
+            return _read_range(p, start, length)
+        return _read_file_cached(p, start, length, st.st_mtime_ns)
+    except Exception as exc:  # pragma: no cover - defensive
+        return f"<cat error: {exc}>"
+
+
+@functools.lru_cache(maxsize=128)
+def _read_file_cached(p: Path, start: int, length: int, mtime_ns: int) -> str:
+    return _read_range(p, start, length)
+
+
+def _read_range(p: Path, start: int, length: int) -> str:
+    # Seek to the requested byte range instead of decoding the whole file.
+    with p.open("rb") as fh:
+        fh.seek(start)
+        data = fh.read(length)
+    return data.decode("utf-8", errors="ignore")
+
+
+def tool_search_text(pattern: str, path: str = ".") -> str:
+    try:
+        p = safe_resolve(path)
+        return _search_text_cached(pattern, p, p.stat().st_mtime_ns)
+    except Exception as exc:  # pragma: no cover - defensive
+        return f"<rg error: {exc}>"
+
+
+@functools.lru_cache(maxsize=256)
+def _search_text_cached(pattern: str, p: Path, mtime_ns: int) -> str:
+    # A directory's mtime only tracks added/removed entries; the per-run
+    # clear_tool_caches() call bounds how stale a search result can get.
+    try:
+        proc = subprocess.Popen(
+            [*RG_ARGS, "-e", pattern, str(p)],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+        )
+    except FileNotFoundError:
+        return "<rg not installed>"
+
+    # Stream matches and stop rg as soon as the output budget is spent.
+    chunks: List[str] = []
+    total = 0
+    drained = False
+    try:
+        for line in proc.stdout:
+            chunks.append(line)
+            total += len(line)
+            if total >= MAX_SEARCH_CHARS:
+                break
+        else:
+            drained = True
+    finally:
+        # Stop rg early (budget spent or read failed) and always reap it.
+        if not drained:
+            proc.kill()
+        _, stderr = proc.communicate()
+    output = "".join(chunks)
+    if total < MAX_SEARCH_CHARS and proc.returncode not in (0, 1):
+        return f"<rg error: {stderr.strip() or output.strip()}>"
+    return output.strip()[:MAX_SEARCH_CHARS]
+
+
+def clear_tool_caches() -> None:
+    """Drop cached tool results; called once per run, not between model turns."""
+    _list_dir_cached.cache_clear()
+    _read_file_cached.cache_clear()
+    _search_text_cached.cache_clear()
+
+
+# Tool name -> implementation; signatures mirror each workflow's TOOLS schema so model
+# args spread directly.
+TOOL_FUNCTIONS: Dict[str, Callable[..., str]] = {
+    "list_dir": tool_list_dir,
+    "read_file": tool_read_file,
+    "search_text": tool_search_text,
+}
+
+
+def dispatch_tool_call(name: str, args: Dict[str, Any]) -> str:
+    fn = TOOL_FUNCTIONS.get(name)
+    if fn is None:
+        return f"<unknown tool: {name}>"
+    try:
+        return fn(**args)
+    except TypeError as exc:
+        return f"<bad arguments for {name}: {exc}>"
+
+
+def write_artifact(filename: str, content: str) -> Path:
+    ARTIFACTS_DIR.mkdir(exist_ok=True)
+    path = ARTIFACTS_DIR / filename
+    path.write_text(content, encoding="utf-8")
+    return path